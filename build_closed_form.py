@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Genera _generated.py con la solución en forma cerrada de la caída con
+rozamiento lineal.
+
+La derivación simbólica con Transformada de Laplace es siempre la misma, así
+que se hace una sola vez acá y el resultado se escribe como código Python.
+caida_rozamiento_laplace.py importa ese módulo y ya no necesita importar
+Sympy al ejecutarse. Hay que volver a correr este script si cambia la
+derivación (es decir, si cambia VERSION_CACHE).
+
+Uso:
+
+    python build_closed_form.py
+"""
+
+from pathlib import Path
+
+import sympy as sp
+from sympy.printing.numpy import NumPyPrinter
+
+from caida_rozamiento_laplace import VERSION_CACHE, construir_solucion_simbolica
+
+RUTA_GENERADO = Path(__file__).with_name("_generated.py")
+
+PLANTILLA = '''\
+# -*- coding: utf-8 -*-
+# Generado por build_closed_form.py a partir de la solución por Transformada
+# de Laplace. No editar a mano: volver a correr build_closed_form.py.
+
+import math
+
+import numpy
+
+VERSION = {version!r}
+
+V_EXPR = {texto!r}
+
+
+def v_closed(t, m, gamma, g, v0):
+    """v(t) evaluada con floats (módulo math)."""
+{cuerpo_math}
+
+
+def v_closed_vec(t, m, gamma, g, v0):
+    """v(t) evaluada con arreglos de NumPy."""
+{cuerpo_numpy}
+'''
+
+
+def generar_cuerpo(reemplazos, expr, imprimir):
+    """
+    Escribe el cuerpo de la función: una asignación por cada subexpresión
+    común encontrada por sp.cse y el return de la expresión reducida.
+    """
+    lineas = [f"    {simbolo} = {imprimir(sub)}" for simbolo, sub in reemplazos]
+    lineas.append(f"    return {imprimir(expr)}")
+    return "\n".join(lineas)
+
+
+def generar_codigo():
+    """
+    Deriva v(t) con Sympy y devuelve el fuente de _generated.py.
+
+    Igual que lambdify(..., cse=True), se eliminan las subexpresiones
+    repetidas (p. ej. v_T = g*m/gamma) para que cada una se calcule una sola
+    vez por llamada.
+    """
+    t, m, gamma, g, v0, v_expr = construir_solucion_simbolica()
+    reemplazos, (expr,) = sp.cse(v_expr.evalf())
+    imprimir_numpy = NumPyPrinter().doprint
+
+    return PLANTILLA.format(
+        version=VERSION_CACHE,
+        texto=str(v_expr),
+        cuerpo_math=generar_cuerpo(reemplazos, expr, sp.pycode),
+        cuerpo_numpy=generar_cuerpo(reemplazos, expr, imprimir_numpy),
+    )
+
+
+def main():
+    RUTA_GENERADO.write_text(generar_codigo(), encoding="utf-8")
+    print(f"Generado {RUTA_GENERADO}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,19 @@
+/*
+ * Kernel en C para evaluar la solución de la caída con rozamiento lineal:
+ *
+ *     out[i] = vT + dv0 * exp(-k * t[i]),   dv0 = v0 - vT
+ *
+ * Se compila como biblioteca compartida desde caida_rozamiento_laplace.py
+ * (backend "c") y se llama mediante ctypes. El pragma, junto con
+ * -fopenmp-simd y -ffast-math, permite que el compilador vectorice el bucle
+ * con instrucciones SIMD (versiones vectoriales de exp de glibc).
+ */
+#include <math.h>
+
+void vcurva(const double *t, int n, double k, double vT, double dv0, double *out)
+{
+#pragma omp simd
+    for (int i = 0; i < n; i++) {
+        out[i] = vT + dv0 * exp(-k * t[i]);
+    }
+}
@@ -15,19 +15,72 @@ Dividiendo por m:
 Se resuelve usando Transformada de Laplace de forma simbólica con Sympy
 y luego se evalúa numéricamente y se grafican una o varias curvas v(t)
 en el mismo gráfico, según escenarios elegidos por el usuario.
+
+Si se ejecutó antes build_closed_form.py, la solución se toma del módulo
+generado _generated.py y Sympy no se importa (salvo para --backend cython).
 """
 
+import argparse
+import collections
+import ctypes
+import functools
+import hashlib
+import importlib.util
+import json
+import os
+import platform
+import stat
+import subprocess
 import sys
+import sysconfig
+from pathlib import Path
 
-import sympy as sp
 import numpy as np
-import matplotlib.pyplot as plt
+import matplotlib
+
+try:
+    import numexpr as ne
+except ImportError:  # numexpr también es opcional
+    ne = None
+
+try:
+    import _generated
+except ImportError:  # sin build_closed_form.py se deriva con Sympy al ejecutar
+    _generated = None
+
+
+# Caché en disco de la solución simbólica. Cambiar la versión invalida
+# las soluciones guardadas si se modifica la derivación.
+VERSION_CACHE = "2"
+DIR_CACHE = Path.home() / ".cache" / "caida_rozamiento"
+
+# Backends disponibles para evaluar las curvas. "numpy" es la forma cerrada;
+# "auto" también la usa: para las grillas de este TP NumPy tarda microsegundos
+# y compilar con numba (sin caché) cuesta casi un segundo por ejecución.
+BACKENDS = ("auto", "numpy", "numba", "numexpr", "cython", "c")
+
+# Fuente del kernel en C para el backend "c" y opciones de compilación.
+# -ffast-math hace falta para que glibc exponga las versiones SIMD de exp
+# (_ZGV*_exp) y el bucle efectivamente se vectorice. Se usa solo al compilar
+# el objeto: si también se pasa al enlazar, GCC (< 13) agrega crtfastmath.o
+# a la biblioteca y, al cargarla con ctypes, activa flush-to-zero y
+# denormals-are-zero para todo el proceso (los subnormales pasan a 0.0).
+FUENTE_KERNEL_C = Path(__file__).with_name("caida_kernel.c")
+FLAGS_COMPILAR_C = ("-O3", "-march=native", "-ffast-math", "-fopenmp-simd", "-fPIC", "-c")
+FLAGS_ENLAZAR_C = ("-shared",)
+
+# Archivo de salida del gráfico cuando no hay pantalla y no se indicó --output
+SALIDA_SIN_PANTALLA = "caida_rozamiento.png"
+
+# Precisión de los arreglos de t y v(t)
+DTYPES = {"f32": np.float32, "f64": np.float64}
 
 
 # ---------------------------------------------------------------------
 # 1) Construcción simbólica de la solución con Transformada de Laplace
 # ---------------------------------------------------------------------
-def construir_solucion_simbolica():
+@functools.lru_cache(maxsize=2)
+def construir_solucion_simbolica(usar_piecewise=False):
     """
     Construye la solución simbólica v(t) usando Transformada de Laplace.
 
@@ -37,14 +90,34 @@ def construir_solucion_simbolica():
     En Laplace:
         m*(s*V(s) - v0) = m*g/s - gamma*V(s)
 
+    La EDO es siempre la misma, así que el resultado se guarda en disco
+    (como srepr) y en las ejecuciones siguientes se lee de ahí en lugar de
+    repetir la transformada inversa.
+
+    Con usar_piecewise=False (por defecto), los Piecewise/Heaviside que pueda
+    dejar la transformada inversa (p. ej. si se agregan tramos, como un
+    paracaídas que se abre en t = t_p) se reescriben con sign(), ver
+    reescribir_sin_piecewise(). Así la expresión sigue siendo compilable
+    con numba.
+
     Retorna:
         t, m, gamma, g, v0, v_expr
     donde v_expr es la expresión simbólica de v(t).
     """
+    import sympy as sp
+
     # Símbolos
     t, s = sp.symbols("t s", real=True, positive=True)
     m, gamma, g, v0 = sp.symbols("m gamma g v0", positive=True)
 
+    sufijo = "_piecewise" if usar_piecewise else ""
+    ruta_cache = DIR_CACHE / f"v_expr_v{VERSION_CACHE}{sufijo}.txt"
+    try:
+        v_expr = sp.sympify(ruta_cache.read_text(encoding="utf-8"))
+        return t, m, gamma, g, v0, v_expr
+    except (OSError, sp.SympifyError):
+        pass
+
     # V(s) = L{v(t)}(s)
     V = sp.Function("V")(s)
 
@@ -55,17 +128,406 @@ def construir_solucion_simbolica():
     # Despejamos V(s)
     V_sol = sp.solve(eq_L, V)[0]
 
-    # Transformada inversa de Laplace para obtener v(t)
-    v_expr = sp.simplify(sp.inverse_laplace_transform(V_sol, s, t))
+    # Transformada inversa de Laplace para obtener v(t). En lugar de
+    # sp.simplify (muchas heurísticas, caro) basta con expandir y agrupar
+    # por el término exponencial: v_T + (v0 - v_T) * exp(-gamma*t/m)
+    v_expr = sp.collect(
+        sp.expand(sp.inverse_laplace_transform(V_sol, s, t)),
+        sp.exp(-gamma * t / m),
+    )
+    if not usar_piecewise:
+        v_expr = reescribir_sin_piecewise(v_expr)
+
+    try:
+        DIR_CACHE.mkdir(parents=True, exist_ok=True)
+        ruta_cache.write_text(sp.srepr(v_expr), encoding="utf-8")
+    except OSError:
+        pass  # sin caché en disco se vuelve a derivar en la próxima ejecución
 
     return t, m, gamma, g, v0, v_expr
 
 
+def reescribir_sin_piecewise(expr):
+    """
+    Reescribe cada Piecewise como suma de tramos multiplicados por
+    Heaviside y cada Heaviside(x) como (1 + sign(x))/2.
+
+    lambdify traduce Piecewise a numpy.select, que numba no puede compilar;
+    sign() en cambio se traduce a np.sign, que numba sí soporta.
+
+    Solo se reescriben los Piecewise cuyas condiciones son desigualdades
+    simples (x < a, x >= a, ...); sobre el borde x = a el resultado es el
+    promedio de los dos tramos, lo que no cambia las curvas continuas. Los
+    demás Piecewise se dejan como están.
+    """
+    import sympy as sp
+
+    def escalon(cond):
+        if isinstance(cond, (sp.Lt, sp.Le)):
+            return sp.Heaviside(cond.rhs - cond.lhs)
+        if isinstance(cond, (sp.Gt, sp.Ge)):
+            return sp.Heaviside(cond.lhs - cond.rhs)
+        return None
+
+    def piecewise_a_heaviside(pw):
+        resultado = sp.S.Zero
+        for tramo, cond in reversed(pw.args):
+            if cond == sp.true:
+                resultado = tramo
+                continue
+            h = escalon(cond)
+            if h is None:
+                return pw
+            resultado = tramo * h + (1 - h) * resultado
+        return resultado
+
+    if not expr.has(sp.Piecewise, sp.Heaviside):
+        return expr
+    expr = expr.replace(lambda x: isinstance(x, sp.Piecewise), piecewise_a_heaviside)
+    return expr.replace(sp.Heaviside, lambda x, *_: (1 + sp.sign(x)) / 2)
+
+
+def construir_funcion_numerica(t, m, gamma, g, v0, v_expr, modulos="numpy"):
+    """
+    Convierte v_expr en una función numérica v_num(t, m, gamma, g, v0).
+
+    Se aplica evalf() antes de lambdify para que las constantes racionales
+    queden como floats, y cse=True para factorizar subexpresiones repetidas
+    como exp(-gamma*t/m). Con el backend "numpy", sign() (que aparece en
+    las expresiones sin Piecewise) se traduce a np.sign; con "math",
+    lambdify ya la escribe en línea con copysign y esa entrada no se usa.
+    """
+    import sympy as sp
+
+    return sp.lambdify(
+        (t, m, gamma, g, v0), v_expr.evalf(), [{"sign": np.sign}, modulos], cse=True
+    )
+
+
+def construir_kernel_numba(v_escalar):
+    """
+    Compila v(t) como ufunc paralela de numba: la función escalar v_escalar
+    (generada o lambdificada con backend "math") se compila con njit y se
+    envuelve con numba.vectorize(target="parallel"), de modo que todos los
+    puntos de todos los escenarios se evalúan repartidos entre los hilos de
+    la CPU.
+
+    La ufunc resultante admite broadcasting, p. ej. t de forma (1, n_puntos)
+    contra parámetros de forma (n_escenarios, 1).
+
+    numba se importa recién acá (tarda bastante) para no pagarlo en las
+    ejecuciones que no lo usan.
+
+    Retorna None si numba no está instalado. Se deja cache=False porque
+    numba no puede cachear código generado por lambdify.
+    """
+    try:
+        from numba import float32, float64, njit, vectorize
+    except ImportError:  # numba es opcional: sin él se usa la forma cerrada en NumPy
+        return None
+
+    f = njit(v_escalar, cache=False)
+
+    # Las firmas explícitas compilan la ufunc en este momento, antes del bucle
+    @vectorize(
+        [
+            float32(float32, float32, float32, float32, float32),
+            float64(float64, float64, float64, float64, float64),
+        ],
+        target="parallel",
+    )
+    def kernel(t_, m_, gamma_, g_, v0_):
+        return f(t_, m_, gamma_, g_, v0_)
+
+    return kernel
+
+
+def construir_kernel_cython():
+    """
+    Compila v_expr con sympy.utilities.autowrap.ufuncify (backend Cython).
+
+    El módulo compilado se guarda en DIR_CACHE, en un directorio que depende
+    del hash de la expresión: la compilación (algunos segundos) se hace una
+    sola vez y las ejecuciones siguientes solo importan el .so.
+
+    La función compilada solo acepta arreglos 1-D de igual longitud, por lo
+    que el kernel retornado hace el broadcasting y aplana los argumentos.
+    Trabaja siempre en float64.
+
+    Retorna None si Cython no está instalado o si no se pudo compilar o
+    cargar el módulo.
+    """
+    if importlib.util.find_spec("Cython") is None:
+        return None
+
+    import sympy as sp
+    from sympy.utilities.autowrap import CodeWrapError, ufuncify
+
+    t, m, gamma, g, v0, v_expr = construir_solucion_simbolica()
+    expr = v_expr.evalf()
+    clave = hashlib.sha1(sp.srepr(expr).encode("utf-8")).hexdigest()[:16]
+    dir_modulo = DIR_CACHE / f"ufuncify_{clave}"
+
+    # Solo se reutilizan módulos compilados para esta versión de Python (ABI)
+    sufijo_ext = sysconfig.get_config_var("EXT_SUFFIX")
+    compilados = sorted(dir_modulo.glob(f"wrapper_module_*{sufijo_ext}"))
+    try:
+        if compilados:
+            nombre = compilados[0].name.split(".")[0]
+            spec = importlib.util.spec_from_file_location(nombre, compilados[0])
+            modulo = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(modulo)
+            f = modulo.autofunc_c
+        else:
+            dir_modulo.mkdir(parents=True, exist_ok=True)
+            f = ufuncify((t, m, gamma, g, v0), expr, backend="cython", tempdir=str(dir_modulo))
+    except (CodeWrapError, ImportError, OSError):
+        return None
+
+    def kernel(*args):
+        arrays = np.broadcast_arrays(*(np.asarray(a, dtype=np.float64) for a in args))
+        planos = [np.ascontiguousarray(a).ravel() for a in arrays]
+        return f(*planos).reshape(arrays[0].shape)
+
+    return kernel
+
+
+def construir_kernel_numexpr():
+    """
+    Evalúa la forma cerrada con numexpr, que recorre t una sola vez,
+    sin arreglos temporales intermedios y repartiendo el trabajo en hilos.
+
+    Retorna None si numexpr no está instalado.
+    """
+    if ne is None:
+        return None
+
+    def kernel(t_vals, m_val, gamma_val, g_val, v0_val):
+        vT = m_val * g_val / gamma_val
+        k = gamma_val / m_val
+        return ne.evaluate(
+            "vT + (v0_val - vT) * exp(-k * t_vals)",
+            local_dict={"vT": vT, "k": k, "v0_val": v0_val, "t_vals": t_vals},
+        )
+
+    return kernel
+
+
+def construir_kernel_c():
+    """
+    Compila caida_kernel.c con FLAGS_COMPILAR_C, para que el bucle se
+    vectorice con SIMD, lo enlaza como biblioteca compartida con
+    FLAGS_ENLAZAR_C (sin -ffast-math, ver la nota junto a esas constantes)
+    y la carga con ctypes.
+
+    La biblioteca se guarda en DIR_CACHE con un nombre que depende del
+    hash del fuente, del compilador, de las opciones y de la máquina: como
+    se compila con -march=native, un .so de otra CPU (p. ej. con el home
+    compartido por NFS) no debe reutilizarse. El compilador se toma de la
+    variable de entorno CC (por defecto "cc").
+
+    El kernel espera t como una sola fila (1, n_puntos) y parámetros de
+    forma (n_escenarios, 1); llama a la función en C una vez por escenario
+    y trabaja siempre en float64.
+
+    Retorna None si no se pudo compilar o cargar la biblioteca.
+    """
+    try:
+        compilador = os.environ.get("CC", "cc")
+        huella = hashlib.sha1(FUENTE_KERNEL_C.read_bytes())
+        partes = (compilador, *FLAGS_COMPILAR_C, "|", *FLAGS_ENLAZAR_C,
+                  platform.machine(), platform.node())
+        for parte in partes:
+            huella.update(b"\0" + parte.encode("utf-8"))
+        ruta_lib = DIR_CACHE / f"caida_kernel_{huella.hexdigest()[:16]}.so"
+        if not ruta_lib.exists():
+            DIR_CACHE.mkdir(parents=True, exist_ok=True)
+            ruta_obj = ruta_lib.with_suffix(".o")
+            subprocess.run(
+                [compilador, *FLAGS_COMPILAR_C, "-o", str(ruta_obj), str(FUENTE_KERNEL_C)],
+                check=True,
+            )
+            subprocess.run(
+                [compilador, *FLAGS_ENLAZAR_C, "-o", str(ruta_lib), str(ruta_obj), "-lm"],
+                check=True,
+            )
+            ruta_obj.unlink()
+        lib = ctypes.CDLL(str(ruta_lib))
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+    arreglo = np.ctypeslib.ndpointer(dtype=np.float64, ndim=1, flags="C_CONTIGUOUS")
+    lib.vcurva.argtypes = [arreglo, ctypes.c_int, ctypes.c_double,
+                           ctypes.c_double, ctypes.c_double, arreglo]
+    lib.vcurva.restype = None
+
+    def kernel(t_vals, m_val, gamma_val, g_val, v0_val):
+        t_fila = np.ascontiguousarray(np.ravel(t_vals), dtype=np.float64)
+        m_val, gamma_val, g_val, v0_val = (
+            np.ravel(a).astype(np.float64) for a in (m_val, gamma_val, g_val, v0_val)
+        )
+        vT = m_val * g_val / gamma_val
+        k = gamma_val / m_val
+        dv0 = v0_val - vT
+
+        V = np.empty((len(k), len(t_fila)))
+        for i in range(len(k)):
+            lib.vcurva(t_fila, len(t_fila), k[i], vT[i], dv0[i], V[i])
+        return V
+
+    return kernel
+
+
+def construir_kernel(backend, v_escalar):
+    """
+    Elige el kernel compilado para evaluar las curvas según el backend.
+
+    Retorna None para usar la forma cerrada en NumPy, ya sea porque se pidió
+    "numpy" o "auto", o porque la dependencia opcional del backend no está
+    instalada.
+    """
+    if backend in ("auto", "numpy"):
+        return None
+
+    if backend == "cython":
+        kernel = construir_kernel_cython()
+        if kernel is None:
+            print("ADVERTENCIA: Cython no está instalado o no se pudo compilar, usando NumPy.")
+        return kernel
+
+    if backend == "c":
+        kernel = construir_kernel_c()
+        if kernel is None:
+            print("ADVERTENCIA: no se pudo compilar el kernel en C, usando NumPy.")
+        return kernel
+
+    if backend == "numexpr":
+        kernel = construir_kernel_numexpr()
+        if kernel is None:
+            print("ADVERTENCIA: numexpr no está instalado, usando NumPy.")
+        return kernel
+
+    kernel = construir_kernel_numba(v_escalar)
+    if kernel is None:
+        print("ADVERTENCIA: numba no está instalado, usando NumPy.")
+    return kernel
+
+
+def obtener_solucion():
+    """
+    Obtiene la solución v(t) y sus funciones numéricas.
+
+    Si existe _generated.py (creado por build_closed_form.py) con la misma
+    VERSION_CACHE, se usa directamente y no hace falta importar Sympy. Si no,
+    se deriva con Transformada de Laplace y se lambdifica.
+
+    Retorna:
+        texto, v_escalar, v_vec
+    donde texto es v(t) como cadena, v_escalar(t, m, gamma, g, v0) evalúa
+    con floats (módulo math) y v_vec(...) con arreglos de NumPy.
+    """
+    if _generated is not None and getattr(_generated, "VERSION", None) == VERSION_CACHE:
+        print("Solución simbólica precalculada (build_closed_form.py).")
+        return _generated.V_EXPR, _generated.v_closed, _generated.v_closed_vec
+
+    print("Construyendo solución simbólica mediante Transformada de Laplace...")
+    t, m, gamma, g, v0, v_expr = construir_solucion_simbolica()
+    # v_escalar (math) evita el costo de envolver cada float en un arreglo
+    v_escalar = construir_funcion_numerica(t, m, gamma, g, v0, v_expr, "math")
+    v_vec = construir_funcion_numerica(t, m, gamma, g, v0, v_expr)
+    return str(v_expr), v_escalar, v_vec
+
+
+def evaluar_velocidad(t_vals, v_terminal, k, v0):
+    """
+    Evalúa en forma cerrada la solución obtenida por Laplace:
+
+        v(t) = v_T + (v0 - v_T) * exp(-k * t),   v_T = m*g/gamma,  k = gamma/m
+
+    Recibe t_vals (n_puntos,) y v_T, k, v0 como arreglos (n_escenarios,), ya
+    calculados, y devuelve todas las curvas con forma (n_escenarios, n_puntos).
+
+    Los escenarios que comparten k (p. ej. solo cambian v0 o g) comparten
+    también el factor exp(-k * t), así que se calcula una sola vez por cada
+    k distinto y las curvas quedan en una suma y un producto.
+
+    Todas las operaciones se hacen in situ sobre el arreglo de salida, sin
+    reservar un arreglo nuevo por cada paso.
+    """
+    V = np.empty((len(k), len(t_vals)), dtype=np.result_type(t_vals, k))
+
+    k_unicos, grupo = np.unique(k, return_inverse=True)
+    if len(k_unicos) == len(k):
+        # Sin k repetidos: el decaimiento se calcula directamente en V
+        np.multiply(-k[:, None], t_vals[None, :], out=V)
+        np.exp(V, out=V)
+    else:
+        decaimiento = np.multiply(-k_unicos[:, None], t_vals[None, :])
+        np.exp(decaimiento, out=decaimiento)
+        # mode="clip" evita que take use un buffer intermedio para out; los
+        # índices de np.unique siempre son válidos
+        np.take(decaimiento, grupo, axis=0, out=V, mode="clip")
+
+    np.multiply(V, (v0 - v_terminal)[:, None], out=V)
+    np.add(V, v_terminal[:, None], out=V)
+    return V
+
+
+def error_terminal(m, gamma, g, v0, t_max):
+    """
+    Calcula en forma analítica la velocidad terminal y la distancia a ella
+    en t = T_max, sin evaluar la curva completa:
+
+        |v(T_max) - v_T| = |v0 - v_T| * exp(-gamma*T_max/m)
+
+    Retorna:
+        error, v_terminal
+    """
+    v_terminal = m * g / gamma
+    return abs(v0 - v_terminal) * np.exp(-gamma * t_max / m), v_terminal
+
+
 # ---------------------------------------------------------------------
 # 2) Lectura de parámetros desde consola
 # ---------------------------------------------------------------------
+# Líneas de stdin pendientes cuando la entrada se redirige desde un archivo
+_lineas_stdin = None
+
+
+def stdin_es_archivo():
+    """
+    Indica si stdin es un archivo regular (python script.py < datos.txt).
+    Los pipes no cuentan: muchas consolas de IDE usan un pipe también para
+    las sesiones interactivas.
+    """
+    try:
+        return stat.S_ISREG(os.fstat(sys.stdin.fileno()).st_mode)
+    except (AttributeError, OSError, ValueError):
+        return False
+
+
+def leer_linea(mensaje):
+    """
+    Equivalente a input(mensaje). Si stdin está redirigido desde un archivo,
+    se lee todo de una vez en la primera llamada y después se van consumiendo
+    las líneas, en lugar de hacer una lectura por cada pregunta.
+    """
+    global _lineas_stdin
+
+    if _lineas_stdin is None and not stdin_es_archivo():
+        return input(mensaje)
+
+    if _lineas_stdin is None:
+        _lineas_stdin = collections.deque(sys.stdin.read().splitlines())
+
+    sys.stdout.write(mensaje)
+    if not _lineas_stdin:
+        raise EOFError
+    return _lineas_stdin.popleft()
+
+
 def leer_float(mensaje, default):
-    txt = input(f"{mensaje} [{default}]: ").strip()
+    txt = leer_linea(f"{mensaje} [{default}]: ").strip()
     if txt == "":
         return float(default)
     try:
@@ -88,6 +550,14 @@ def pedir_configuracion_global():
     n_puntos = int(leer_float("Cantidad de puntos para la simulación", 500))
     n_escenarios = int(leer_float("Cantidad de escenarios a simular", 1))
 
+    return validar_configuracion(t_max, n_puntos, n_escenarios)
+
+
+def validar_configuracion(t_max, n_puntos, n_escenarios):
+    """
+    Valida los parámetros globales; corrige los que tienen un valor
+    razonable de reemplazo y sale del programa si T_max no es positivo.
+    """
     if t_max <= 0:
         print("\nERROR: T_max debe ser positivo.")
         sys.exit(1)
@@ -121,7 +591,7 @@ def pedir_escenarios(n_escenarios):
     print("\n=== Definición de escenarios ===")
     for i in range(n_escenarios):
         print(f"\nEscenario {i+1}:")
-        nombre = input("Nombre/etiqueta del escenario (opcional): ").strip()
+        nombre = leer_linea("Nombre/etiqueta del escenario (opcional): ").strip()
         if nombre == "":
             nombre = f"Escenario {i+1}"
 
@@ -130,9 +600,7 @@ def pedir_escenarios(n_escenarios):
         g_val = leer_float("  Gravedad g (m/s^2)", 9.81)
         v0_val = leer_float("  Velocidad inicial v(0) (m/s)", 0.0)
 
-        if m_val <= 0 or gamma_val <= 0:
-            print("  ERROR: m y gamma deben ser positivos. Saliendo.")
-            sys.exit(1)
+        validar_escenario(m_val, gamma_val)
 
         escenarios.append(
             {
@@ -147,57 +615,224 @@ def pedir_escenarios(n_escenarios):
     return escenarios
 
 
+def validar_escenario(m_val, gamma_val):
+    if m_val <= 0 or gamma_val <= 0:
+        print("  ERROR: m y gamma deben ser positivos. Saliendo.")
+        sys.exit(1)
+
+
+def leer_escenarios_json(ruta):
+    """
+    Lee la configuración completa desde un archivo JSON, sin pedir nada por
+    consola. El archivo puede ser directamente la lista de escenarios o un
+    objeto con la configuración global:
+
+        {
+            "t_max": 10.0,
+            "n_puntos": 500,
+            "escenarios": [
+                {"nombre": "Base", "m": 80.0, "gamma": 12.0, "g": 9.81, "v0": 0.0},
+                ...
+            ]
+        }
+
+    Los campos que falten toman los mismos valores por defecto que en la
+    lectura por consola.
+
+    Retorna:
+        t_max, n_puntos, lista_escenarios
+    """
+    try:
+        datos = json.loads(ruta.read_text(encoding="utf-8"))
+    except (OSError, ValueError) as exc:
+        print(f"\nERROR: no se pudo leer {ruta}: {exc}")
+        sys.exit(1)
+
+    if isinstance(datos, list):
+        datos = {"escenarios": datos}
+
+    try:
+        crudos = datos["escenarios"]
+        if not crudos:
+            print(f"\nERROR: {ruta} no define ningún escenario.")
+            sys.exit(1)
+
+        t_max, n_puntos, _ = validar_configuracion(
+            float(datos.get("t_max", 10.0)), int(datos.get("n_puntos", 500)), len(crudos)
+        )
+
+        escenarios = []
+        for i, esc in enumerate(crudos):
+            m_val = float(esc.get("m", 80.0))
+            gamma_val = float(esc.get("gamma", 12.0))
+            validar_escenario(m_val, gamma_val)
+
+            escenarios.append(
+                {
+                    "nombre": str(esc.get("nombre") or f"Escenario {i+1}"),
+                    "m": m_val,
+                    "gamma": gamma_val,
+                    "g": float(esc.get("g", 9.81)),
+                    "v0": float(esc.get("v0", 0.0)),
+                }
+            )
+    except (AttributeError, KeyError, TypeError, ValueError) as exc:
+        print(f"\nERROR: formato de escenarios inválido en {ruta}: {exc}")
+        sys.exit(1)
+
+    return t_max, n_puntos, escenarios
+
+
+def hay_pantalla():
+    """
+    Indica si hay una pantalla donde mostrar el gráfico. En Linux se mira
+    DISPLAY / WAYLAND_DISPLAY; en otros sistemas se asume que sí.
+    """
+    if not sys.platform.startswith("linux"):
+        return True
+    return "DISPLAY" in os.environ or "WAYLAND_DISPLAY" in os.environ
+
+
+def parsear_argumentos(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Caída vertical con rozamiento lineal resuelta con Transformada de Laplace."
+    )
+    parser.add_argument(
+        "--no-plot",
+        action="store_true",
+        help="solo imprime el resumen por escenario, sin evaluar ni graficar las curvas",
+    )
+    parser.add_argument(
+        "--verificar",
+        action="store_true",
+        help="compara las curvas evaluadas contra la solución de Laplace "
+             "lambdificada (agrega una evaluación completa de las curvas)",
+    )
+    parser.add_argument(
+        "--scenarios",
+        type=Path,
+        metavar="ARCHIVO.json",
+        help="lee la configuración y los escenarios desde un archivo JSON "
+             "en lugar de pedirlos por consola",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=BACKENDS,
+        default="auto",
+        help="cómo evaluar las curvas: forma cerrada en NumPy, numba, numexpr, "
+             "Cython (ufuncify) o un kernel en C vía ctypes; 'auto' usa la forma "
+             "cerrada en NumPy (default: auto)",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        metavar="ARCHIVO.png",
+        help="guarda el gráfico en un archivo (backend Agg) en lugar de mostrarlo "
+             "en una ventana",
+    )
+    parser.add_argument(
+        "--dtype",
+        choices=DTYPES,
+        default="f64",
+        help="precisión de las curvas; f32 alcanza para graficar y reduce a la "
+             "mitad la memoria recorrida (default: f64)",
+    )
+    return parser.parse_args(argv)
+
+
 # ---------------------------------------------------------------------
 # 3) Función principal
 # ---------------------------------------------------------------------
-def main():
-    # 1) Construimos la solución simbólica una sola vez
-    print("Construyendo solución simbólica mediante Transformada de Laplace...")
-    t, m, gamma, g, v0, v_expr = construir_solucion_simbolica()
-    print("Solución simbólica v(t):")
-    print(f"  v(t) = {v_expr}\n")
-
-    # 2) Pedimos configuración global y escenarios
-    t_max, n_puntos, n_escenarios = pedir_configuracion_global()
-    escenarios = pedir_escenarios(n_escenarios)
+def main(argv=None):
+    args = parsear_argumentos(argv)
 
-    # 3) Convertimos la expresión simbólica a función numérica
-    #    v_num(t, m, gamma, g, v0)
-    v_num = sp.lambdify((t, m, gamma, g, v0), v_expr, "numpy")
-
-    # 4) Vector de tiempos compartido por todos los escenarios
-    t_vals = np.linspace(0.0, t_max, n_puntos)
+    # 1) Obtenemos la solución (precalculada o derivada con Sympy) una sola
+    #    vez, junto con sus funciones numéricas escalar y vectorial
+    texto_v, v_num_scalar, v_num_vec = obtener_solucion()
+    print("Solución simbólica v(t):")
+    print(f"  v(t) = {texto_v}\n")
 
-    # 5) Gráfico
-    plt.figure(figsize=(9, 5))
+    # 2) Configuración global y escenarios: desde JSON o por consola
+    if args.scenarios is not None:
+        t_max, n_puntos, escenarios = leer_escenarios_json(args.scenarios)
+    else:
+        t_max, n_puntos, n_escenarios = pedir_configuracion_global()
+        escenarios = pedir_escenarios(n_escenarios)
 
+    # 3) Resumen por escenario, calculado en forma analítica
     print("\n=== Resultados por escenario ===")
     for esc in escenarios:
-        nombre = esc["nombre"]
         m_val = esc["m"]
         gamma_val = esc["gamma"]
         g_val = esc["g"]
         v0_val = esc["v0"]
 
-        # Evaluamos v(t) numéricamente
-        v_vals = v_num(t_vals, m_val, gamma_val, g_val, v0_val)
+        err, v_terminal = error_terminal(m_val, gamma_val, g_val, v0_val, t_max)
 
-        # Velocidad terminal para este escenario
-        v_terminal = m_val * g_val / gamma_val
+        # Valor puntual en T_max, evaluado en escalar
+        v_tmax = v_num_scalar(t_max, m_val, gamma_val, g_val, v0_val)
 
-        print(f"\n{nombre}:")
+        print(f"\n{esc['nombre']}:")
         print(f"  m = {m_val} kg, gamma = {gamma_val} kg/s, g = {g_val} m/s^2, v0 = {v0_val} m/s")
         print(f"  Velocidad terminal v_T = m g / gamma = {v_terminal:.4f} m/s")
-        print(f"  v({t_max}) = {v_vals[-1]:.4f} m/s")
-        print(f"  |v(T_max) - v_T| = {abs(v_vals[-1] - v_terminal):.4e} m/s")
+        print(f"  v({t_max}) = {v_tmax:.4f} m/s")
+        print(f"  |v(T_max) - v_T| = {err:.4e} m/s")
+
+    if args.no_plot:
+        return
 
-        # Curva de velocidad
-        etiqueta_curva = f"{nombre} (m={m_val}, γ={gamma_val})"
-        plt.plot(t_vals, v_vals, label=etiqueta_curva)
+    # Kernel compilado para evaluar las curvas (None para usar la forma
+    # cerrada en NumPy)
+    v_curva = construir_kernel(args.backend, v_num_scalar)
+
+    # 4) Vector de tiempos compartido por todos los escenarios
+    dtype = DTYPES[args.dtype]
+    t_vals = np.linspace(0.0, t_max, n_puntos, dtype=dtype)
+
+    # Parámetros de todos los escenarios como vectores columna (n_escenarios, 1)
+    params = np.array([[e["m"], e["gamma"], e["g"], e["v0"]] for e in escenarios], dtype=dtype)
+    m_arr = params[:, 0:1]
+    gamma_arr = params[:, 1:2]
+    g_arr = params[:, 2:3]
+    v0_arr = params[:, 3:4]
+
+    # Evaluamos todas las curvas en una sola llamada, con broadcasting contra
+    # t (1, n_puntos): V tiene forma (n_escenarios, n_puntos)
+    if v_curva is not None:
+        V = v_curva(t_vals[None, :], m_arr, gamma_arr, g_arr, v0_arr)
+    else:
+        m_esc, gamma_esc, g_esc, v0_esc = params.T
+        V = evaluar_velocidad(t_vals, m_esc * g_esc / gamma_esc, gamma_esc / m_esc, v0_esc)
+
+    # Control opcional (--verificar): las curvas evaluadas deben coincidir
+    # con la solución de Laplace. Cuesta otra evaluación completa de V.
+    if args.verificar:
+        V_laplace = v_num_vec(t_vals[None, :], m_arr, gamma_arr, g_arr, v0_arr)
+        error_laplace = np.max(np.abs(V - V_laplace), axis=1)
+        print("\n=== Control contra la solución de Laplace ===")
+        for esc, err in zip(escenarios, error_laplace):
+            print(f"  {esc['nombre']}: max |v - v_Laplace| = {err:.4e} m/s")
+
+    # 5) Gráfico. Sin pantalla, o si se pidió un archivo, se usa el backend
+    #    Agg: no carga ninguna interfaz gráfica y guarda directo a PNG
+    salida = args.output
+    if salida is None and not hay_pantalla():
+        salida = Path(SALIDA_SIN_PANTALLA)
+    if salida is not None:
+        matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    plt.figure(figsize=(9, 5))
+
+    # Todas las curvas en una sola llamada: con V.T (n_puntos, n_escenarios)
+    # matplotlib crea una línea por columna; después solo se etiquetan
+    lineas = plt.plot(t_vals, V.T)
+    for linea, esc in zip(lineas, escenarios):
+        linea.set_label(f"{esc['nombre']} (m={esc['m']}, γ={esc['gamma']})")
 
         # (Opcional) línea horizontal de velocidad terminal para cada escenario
         # Puede ensuciar el gráfico si hay muchos escenarios; activalo si querés.
-        # plt.axhline(v_terminal, linestyle="--", alpha=0.4)
+        # plt.axhline(esc["m"] * esc["g"] / esc["gamma"], linestyle="--", alpha=0.4)
 
     plt.xlabel("t (s)")
     plt.ylabel("v(t) (m/s)")
@@ -205,7 +840,12 @@ def main():
     plt.grid(True)
     plt.legend()
     plt.tight_layout()
-    plt.show()
+
+    if salida is not None:
+        plt.savefig(salida, dpi=100)
+        print(f"\nGráfico guardado en {salida}")
+    else:
+        plt.show()
 
 
 if __name__ == "__main__":